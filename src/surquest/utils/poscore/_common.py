@@ -0,0 +1,101 @@
+"""
+Request and response helpers shared by `Client` and `AsyncClient`.
+"""
+
+from __future__ import annotations
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional
+from urllib.parse import unquote
+import orjson
+import re
+
+# Connection limits of the pooled httpx clients (HTTP2Session and AsyncClient)
+MAX_CONNECTIONS = 32
+MAX_KEEPALIVE_CONNECTIONS = 16
+
+# Bodies are serialized with orjson and sent as raw data
+JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+
+# Plain `filename="name"` form, used when no extended form is present
+_FILENAME_RE = re.compile(r"filename\s*=\s*\"?([^\";]+)\"?", re.IGNORECASE)
+# RFC 6266 / 5987 extended form: filename*=charset'lang'percent-encoded-value
+_FILENAME_EXT_RE = re.compile(r"filename\*\s*=\s*([^';]*)'[^']*'([^;\s]+)", re.IGNORECASE)
+
+# Filter body sent when no filter is given; serialized once at import
+_EMPTY_FILTER_BODY = orjson.dumps(
+    {"locations": [], "cmCarriers": [], "components": [], "taskTypes": []}
+)
+
+
+@lru_cache(maxsize=256)
+def extract_filename(content_disposition: str) -> str:
+    """Extract filename from a Content-Disposition header value.
+
+    Returns 'unknown' when a filename cannot be determined.
+    """
+    if not content_disposition:
+        return "unknown"
+
+    # The extended form takes precedence over the plain ASCII fallback
+    match = _FILENAME_EXT_RE.search(content_disposition)
+    if match is not None:
+        charset = match.group(1).strip() or "utf-8"
+        try:
+            return unquote(match.group(2), encoding=charset, errors="replace")
+        except LookupError:
+            return unquote(match.group(2), errors="replace")
+
+    match = _FILENAME_RE.search(content_disposition)
+    if match is None:
+        return "unknown"
+
+    return match.group(1).strip()
+
+
+def blob_metadata(headers: Mapping[str, str]) -> Dict[str, Any]:
+    """Build the `Blob` fields described by the headers of a download response."""
+    # Content-Length describes the encoded body; only trust it for identity encoding
+    content_length = None
+    if "Content-Encoding" not in headers:
+        content_length = headers.get("Content-Length")
+
+    return {
+        "file_name": extract_filename(headers.get("Content-Disposition", "")),
+        "content_type": headers.get("Content-Type", "application/octet-stream"),
+        "content_length": content_length,
+    }
+
+
+def campaign_params(
+    size: int, page: int, orderby: str, expand: bool, extra: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Build the query parameters of the campaigns endpoint."""
+    params = {
+        "size": size,
+        "page": page,
+        "orderby": orderby,
+        "expand": "true" if expand else "false",
+    }
+    params.update(extra)
+
+    return params
+
+
+def filter_body(
+    locations: Optional[List[int]],
+    cm_carriers: Optional[List[int]],
+    components: Optional[List[int]],
+    task_types: Optional[List[int]],
+) -> bytes:
+    """Serialize the JSON filter body of the installation progress endpoints."""
+    if not (locations or cm_carriers or components or task_types):
+        return _EMPTY_FILTER_BODY
+
+    return orjson.dumps(
+        {
+            "locations": locations or [],
+            "cmCarriers": cm_carriers or [],
+            "components": components or [],
+            "taskTypes": task_types or [],
+        }
+    )
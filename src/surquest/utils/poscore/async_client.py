@@ -0,0 +1,262 @@
+"""
+Asynchronous client for POS Media Data Core API built on `httpx`.
+"""
+
+from __future__ import annotations
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Union
+import uuid
+import httpx
+import orjson
+from ._common import (
+    JSON_CONTENT_TYPE,
+    MAX_CONNECTIONS,
+    MAX_KEEPALIVE_CONNECTIONS,
+    blob_metadata,
+    campaign_params,
+    filter_body,
+)
+from .credentials import Credentials
+from .models import CampaignResponse, Campaign, InstallationStatusPayload, Blob
+
+
+class AsyncClient:
+    # Upper bound of concurrently fetched pages and documents
+    MAX_CONCURRENT_PAGES = 8
+    MAX_CONCURRENT_DOWNLOADS = 8
+
+    def __init__(
+        self, credentials: Credentials, http_client: Optional[httpx.AsyncClient] = None
+    ) -> None:
+        """
+        Initialize the asynchronous POS Core Client.
+
+        Args:
+            credentials: An instance of the Credentials class to handle authentication.
+                Tokens are obtained through its own session.
+            http_client: Optional `httpx.AsyncClient` to send API requests with. When omitted,
+                an HTTP/2 client with pooled keep-alive connections is created.
+        """
+        self.credentials = credentials
+        self.http_client = http_client or httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=None,
+        )
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self.http_client.aclose()
+
+    async def _authorization_header(self) -> Dict[str, str]:
+        """Return the Authorization header without blocking the event loop.
+
+        A missing or expired token triggers a blocking `requests` login/refresh
+        (possibly waiting on the refresh lock), so it runs in a worker thread.
+        """
+        return await asyncio.to_thread(lambda: self.credentials.authorization_header)
+
+    async def _download_blob(self, response: httpx.Response, blob_id: Any) -> Blob:
+        """Spool a streamed httpx response into a `Blob`, then release the response."""
+        try:
+            response.raise_for_status()
+
+            spool = Blob.spool()
+            async for chunk in response.aiter_bytes(Blob.CHUNK_SIZE):
+                spool.write(chunk)
+            spool.seek(0)
+        finally:
+            await response.aclose()
+
+        return Blob(file=spool, id=blob_id, **blob_metadata(response.headers))
+
+    async def get_campaigns(
+        self,
+        size: int = 250,
+        page: int = 0,
+        orderby: str = "created desc",
+        expand: bool = True,
+        fetch_all: bool = True,
+        **kwargs: Any,
+    ) -> List[Campaign]:
+        """
+        Retrieve a list of campaigns.
+
+        Args:
+            size: Number of records per page.
+            page: Page number (0-based).
+            orderby: Sorting criteria (e.g. "created desc").
+            expand: Whether to expand related entities.
+            fetch_all: Whether to fetch all pages or just the requested one.
+                Pages after the first are fetched concurrently (up to `MAX_CONCURRENT_PAGES`).
+            **kwargs: Additional query parameters.
+
+        Returns:
+            A list of campaigns in page order.
+        """
+        endpoint = f"{self.credentials.base_url}/cm/campaigns"
+        headers = await self._authorization_header()
+        params = campaign_params(size, page, orderby, expand, kwargs)
+
+        # The first page reveals pageCount, the rest can be fetched concurrently
+        campaign_response = await self._fetch_campaign_page(endpoint, params, headers)
+        campaigns = list(campaign_response.data)
+
+        if not fetch_all:
+            return campaigns
+
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PAGES)
+
+        async def fetch(p: int) -> CampaignResponse:
+            async with semaphore:
+                return await self._fetch_campaign_page(endpoint, {**params, "page": p}, headers)
+
+        # gather preserves the order of its arguments
+        responses = await asyncio.gather(
+            *[fetch(p) for p in range(page + 1, campaign_response.pageCount)]
+        )
+        for response in responses:
+            campaigns.extend(response.data)
+
+        return campaigns
+
+    async def _fetch_campaign_page(
+        self, endpoint: str, params: Dict[str, Any], headers: Dict[str, str]
+    ) -> CampaignResponse:
+        """Fetch and parse a single page of campaigns."""
+        response = await self.http_client.get(endpoint, params=params, headers=headers)
+        response.raise_for_status()
+
+        return CampaignResponse.model_validate_json(response.content)
+
+    async def get_campaign_installations(
+        self,
+        campaign_id: int,
+        locations: Optional[List[int]] = None,
+        cm_carriers: Optional[List[int]] = None,
+        components: Optional[List[int]] = None,
+        task_types: Optional[List[int]] = None,
+        validate: bool = True,
+    ) -> Union[InstallationStatusPayload, Dict[str, Any]]:
+        """
+        Fetch campaign installations progress summary.
+
+        Args:
+            campaign_id: The ID of the campaign.
+            locations: List of locations to filter by.
+            cm_carriers: List of CM carriers to filter by.
+            components: List of components to filter by.
+            task_types: List of task types to filter by.
+            validate: Whether to validate the response into models. When False,
+                the parsed JSON dict is returned as-is.
+
+        Returns:
+            The installation progress summary, or the raw dict when `validate` is False.
+        """
+        endpoint = f"{self.credentials.base_url}/cm/campaigns/{campaign_id}/installationprogresssummary"
+        headers = await self._authorization_header()
+        body = filter_body(locations, cm_carriers, components, task_types)
+
+        response = await self.http_client.post(
+            endpoint, content=body, headers={**headers, **JSON_CONTENT_TYPE}
+        )
+        response.raise_for_status()
+
+        if not validate:
+            return orjson.loads(response.content)
+
+        return InstallationStatusPayload.model_validate_json(response.content)
+
+    async def fetch_document(self, document_id: uuid.UUID, thumbnail: bool = False) -> Blob:
+        """Fetch a document by its ID.
+
+        Args:
+            document_id: The UUID of the document to fetch.
+            thumbnail: Whether to fetch the thumbnail version.
+        Returns:
+            The document as a `Blob` spooled from the streamed response.
+        """
+        endpoint = f"{self.credentials.base_url}/cm/documents/{document_id}"
+        headers = await self._authorization_header()
+
+        if thumbnail is True:
+
+            endpoint += "/thumbnail"
+
+        request = self.http_client.build_request(
+            "GET", endpoint, headers=headers, params={"skipValidation": True}
+        )
+        response = await self.http_client.send(request, stream=True)
+
+        return await self._download_blob(response, document_id)
+
+    async def fetch_documents(
+        self, document_ids: Iterable[uuid.UUID], thumbnail: bool = False
+    ) -> List[Union[Blob, Exception]]:
+        """Fetch many documents concurrently, at most `MAX_CONCURRENT_DOWNLOADS` at a time.
+
+        Args:
+            document_ids: The UUIDs of the documents to fetch.
+            thumbnail: Whether to fetch the thumbnail versions.
+        Returns:
+            One entry per id in input order: the `Blob`, or the exception raised
+            while fetching it. A failed document does not abort the batch.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_DOWNLOADS)
+
+        async def fetch(document_id: uuid.UUID) -> Blob:
+            async with semaphore:
+                return await self.fetch_document(document_id, thumbnail=thumbnail)
+
+        return await asyncio.gather(
+            *[fetch(document_id) for document_id in document_ids],
+            return_exceptions=True,
+        )
+
+    async def export_photos(
+        self,
+        campaign_id: int,
+        all=False,
+        locations: Optional[List[int]] = None,
+        cm_carriers: Optional[List[int]] = None,
+        components: Optional[List[int]] = None,
+        task_types: Optional[List[int]] = None,
+    ) -> Blob:
+        """
+        Export photos of a campaign.
+
+        Args:
+            campaign_id: The ID of the campaign.
+            all: Whether to include all photos.
+            locations: List of locations to filter by.
+            cm_carriers: List of CM carriers to filter by.
+            components: List of components to filter by.
+            task_types: List of task types to filter by.
+
+        Returns:
+            The exported photos archive as a `Blob` spooled from the streamed response.
+        """
+        endpoint = f"{self.credentials.base_url}/cm/campaigns/{campaign_id}/installationprogresssummary/photos"
+        headers = await self._authorization_header()
+        params = {"all": "true" if all else "false"}
+        body = filter_body(locations, cm_carriers, components, task_types)
+
+        request = self.http_client.build_request(
+            "POST",
+            endpoint,
+            headers={**headers, **JSON_CONTENT_TYPE},
+            params=params,
+            content=body,
+        )
+        response = await self.http_client.send(request, stream=True)
+
+        return await self._download_blob(response, campaign_id)
@@ -3,13 +3,55 @@ Client for POS Media Data Core API.
 """
 
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from ._common import JSON_CONTENT_TYPE, blob_metadata, campaign_params, filter_body
 from .credentials import Credentials
+import orjson
+import threading
+import time
 import uuid
-from .models import CampaignResponse, Campaign, InstallationStatusPayload, Blob
+import requests
+from .models.blobs import Blob
+
+if TYPE_CHECKING:
+    from .models import CampaignResponse, Campaign, InstallationStatusPayload
+
+
+class _TokenBucket:
+    """Thread-safe token bucket spacing requests to at most `rate` per second."""
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until it becomes available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token up front so waiting callers queue behind each other
+            self._tokens -= 1
+            wait = -self._tokens / self.rate
+
+        if wait > 0:
+            time.sleep(wait)
 
 
 class Client:
+    # Upper bound of concurrently fetched pages
+    MAX_WORKERS = 8
+    # Per-host limits applied to batched document downloads
+    MAX_CONCURRENT_DOWNLOADS = 4
+    DOWNLOADS_PER_SECOND = 5
+    # Conditional-request cache: entries kept (LRU) and largest document kept in memory
+    ETAG_CACHE_SIZE = 64
+    ETAG_CACHE_MAX_DOCUMENT_SIZE = 1 << 20
+
     def __init__(self, credentials: Credentials) -> None:
         """
         Initialize the POS Core Client.
@@ -20,21 +62,43 @@ class Client:
         self.credentials = credentials
         # Reuse the session from credentials if available, otherwise create a new one
         self.session = self.credentials.session
+        # Last seen ETag and body per GET resource, used for conditional requests
+        self._etag_cache: OrderedDict[Any, Tuple[str, Any]] = OrderedDict()
+        self._etag_lock = threading.Lock()
+        # Shared by all fetch_documents batches so they cannot overload the host together
+        self._host_sem = threading.BoundedSemaphore(self.MAX_CONCURRENT_DOWNLOADS)
+        self._rate_limiter = _TokenBucket(self.DOWNLOADS_PER_SECOND)
 
-    @staticmethod
-    def _extract_filename(content_disposition: str) -> str:
-        """Extract filename from a Content-Disposition header value.
+    def _download_blob(self, response: requests.Response, blob_id: Any) -> Blob:
+        """Spool a streamed response body into a `Blob` chunk by chunk.
 
-        Returns 'unknown' when a filename cannot be determined.
+        The response is always closed so the connection returns to the pool.
         """
-        filename = "unknown"
-        if content_disposition:
-            parts = content_disposition.split("filename=")
-            if len(parts) > 1:
-                filename = parts[1].strip().strip('"')
-
-        return filename
-    
+        with response:
+            response.raise_for_status()
+
+            return Blob.from_chunks(
+                response.iter_content(chunk_size=Blob.CHUNK_SIZE),
+                id=blob_id,
+                **blob_metadata(response.headers),
+            )
+
+    def _etag_get(self, key: Any) -> Optional[Tuple[str, Any]]:
+        """Return the cached `(etag, value)` for `key`, marking it recently used."""
+        with self._etag_lock:
+            cached = self._etag_cache.get(key)
+            if cached is not None:
+                self._etag_cache.move_to_end(key)
+            return cached
+
+    def _etag_put(self, key: Any, etag: str, value: Any) -> None:
+        """Cache `(etag, value)` for `key`, evicting the least recently used entries."""
+        with self._etag_lock:
+            self._etag_cache[key] = (etag, value)
+            self._etag_cache.move_to_end(key)
+            while len(self._etag_cache) > self.ETAG_CACHE_SIZE:
+                self._etag_cache.popitem(last=False)
+
     def get_campaigns(
         self,
         size: int = 250,
@@ -53,49 +117,120 @@ class Client:
             orderby: Sorting criteria (e.g. "created desc").
             expand: Whether to expand related entities.
             fetch_all: Whether to fetch all pages or just the requested one.
+                Pages after the first are fetched concurrently (up to `MAX_WORKERS`).
             **kwargs: Additional query parameters.
 
         Returns:
-            A list of campaigns (dictionaries).
+            A list of campaigns in page order.
         """
         endpoint = f"{self.credentials.base_url}/cm/campaigns"
         headers = self.credentials.authorization_header
+        params = campaign_params(size, page, orderby, expand, kwargs)
+
+        # The first page reveals pageCount, the rest can be fetched concurrently
+        campaign_response = self._fetch_campaign_page(endpoint, params, headers)
+        campaigns = list(campaign_response.data)
+
+        if not fetch_all or campaign_response.currentPage >= campaign_response.pageCount:
+            return campaigns
+
+        pages = range(page + 1, campaign_response.pageCount)
+        if not pages:
+            return campaigns
+
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(pages))) as executor:
+            # Futures are kept in page order so results are extended in order
+            futures = [
+                executor.submit(
+                    self._fetch_campaign_page, endpoint, {**params, "page": p}, headers
+                )
+                for p in pages
+            ]
+            for future in futures:
+                campaigns.extend(future.result().data)
 
-        campaigns = []
-
-        while True:
-            params = {
-                "size": size,
-                "page": page,
-                "orderby": orderby,
-                "expand": str(expand).lower(),
-            }
-            params.update(kwargs)
+        return campaigns
 
-            response = self.session.get(endpoint, params=params, headers=headers)
-            response.raise_for_status()
+    def iter_campaigns(
+        self,
+        size: int = 250,
+        page: int = 0,
+        orderby: str = "created desc",
+        expand: bool = True,
+        **kwargs: Any,
+    ) -> Iterator[Campaign]:
+        """
+        Lazily iterate over campaigns, page by page.
 
-            response_data = response.json()
+        The next page is requested in the background while the current one is
+        consumed, so at most two pages are held in memory and callers that stop
+        early do not pay for the remaining pages.
 
-            # Convert to CampaignResponse model to leverage Pydantic parsing
-            campaign_response = CampaignResponse.model_validate(response_data)
+        Args:
+            size: Number of records per page.
+            page: Page number (0-based) to start from.
+            orderby: Sorting criteria (e.g. "created desc").
+            expand: Whether to expand related entities.
+            **kwargs: Additional query parameters.
 
-            page_count = campaign_response.pageCount
-            current_page = campaign_response.currentPage
-            data = campaign_response.data
+        Yields:
+            Campaigns in page order.
+        """
+        endpoint = f"{self.credentials.base_url}/cm/campaigns"
+        params = campaign_params(size, page, orderby, expand, kwargs)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(
+                self._fetch_campaign_page,
+                endpoint,
+                params,
+                self.credentials.authorization_header,
+            )
+
+            while future is not None:
+                campaign_response = future.result()
+
+                # Prefetch the following page before handing out the current one
+                future = None
+                if page + 1 < campaign_response.pageCount:
+                    page += 1
+                    future = executor.submit(
+                        self._fetch_campaign_page,
+                        endpoint,
+                        {**params, "page": page},
+                        self.credentials.authorization_header,
+                    )
+
+                yield from campaign_response.data
+
+    def _fetch_campaign_page(
+        self, endpoint: str, params: Dict[str, Any], headers: Dict[str, str]
+    ) -> CampaignResponse:
+        """Fetch and parse a single page of campaigns.
+
+        Pages seen before are requested conditionally; on `304 Not Modified` the
+        cached body is parsed again, so callers never share model instances.
+        """
+        from .models import CampaignResponse
 
-            campaigns.extend(data)
+        cache_key = (endpoint, tuple(sorted((k, str(v)) for k, v in params.items())))
+        cached = self._etag_get(cache_key)
+        if cached is not None:
+            headers = {**headers, "If-None-Match": cached[0]}
 
-            if not fetch_all:
-                break
+        response = self.session.get(endpoint, params=params, headers=headers)
+        if cached is not None and response.status_code == 304:
+            return CampaignResponse.model_validate_json(cached[1])
+        response.raise_for_status()
 
-            if page_count is not None and current_page is not None:
-                if current_page >= page_count:
-                    break
+        # Validate the raw body in pydantic-core, skipping the intermediate dict
+        campaign_response = CampaignResponse.model_validate_json(response.content)
 
-            page += 1
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etag_put(cache_key, etag, response.content)
 
-        return campaigns
+        return campaign_response
 
     def get_campaign_installations(
         self,
@@ -104,7 +239,8 @@ class Client:
         cm_carriers: Optional[List[int]] = None,
         components: Optional[List[int]] = None,
         task_types: Optional[List[int]] = None,
-    ) -> InstallationStatusPayload:
+        validate: bool = True,
+    ) -> Union[InstallationStatusPayload, Dict[str, Any]]:
         """
         Fetch campaign installations progress summary.
 
@@ -114,26 +250,32 @@ class Client:
             cm_carriers: List of CM carriers to filter by.
             components: List of components to filter by.
             task_types: List of task types to filter by.
+            validate: Whether to validate the response into models. When False,
+                the parsed JSON dict is returned as-is, skipping the per-row
+                validation of large summaries.
 
         Returns:
-            The installation progress summary.
+            The installation progress summary, or the raw dict when `validate` is False.
         """
         endpoint = f"{self.credentials.base_url}/cm/campaigns/{campaign_id}/installationprogresssummary"
         headers = self.credentials.authorization_header
 
-        payload = {
-            "locations": locations or [],
-            "cmCarriers": cm_carriers or [],
-            "components": components or [],
-            "taskTypes": task_types or [],
-        }
+        body = filter_body(locations, cm_carriers, components, task_types)
 
-        response = self.session.post(endpoint, json=payload, headers=headers)
+        response = self.session.post(
+            endpoint, data=body, headers={**headers, **JSON_CONTENT_TYPE}
+        )
         response.raise_for_status()
 
-        response_data = response.json()
+        if not validate:
+            return orjson.loads(response.content)
 
-        installation_status = InstallationStatusPayload.model_validate(response_data)
+        from .models import InstallationStatusPayload
+
+        # Validate the raw body in pydantic-core, skipping the intermediate dict
+        installation_status = InstallationStatusPayload.model_validate_json(
+            response.content
+        )
 
         return installation_status
 
@@ -144,7 +286,7 @@ class Client:
             document_id: The UUID of the document to fetch.
             thumbnail: Whether to fetch the thumbnail version.
         Returns:
-            The document content as bytes.
+            The document as a `Blob` spooled from the streamed response.
         """
         endpoint = f"{self.credentials.base_url}/cm/documents/{document_id}"
         headers = self.credentials.authorization_header
@@ -155,20 +297,72 @@ class Client:
 
         params = {"skipValidation": True}
 
-        response = self.session.get(endpoint, headers=headers, params=params)
-        response.raise_for_status()
-
-        content_disposition = response.headers.get("Content-Disposition", "")
-        filename = self._extract_filename(content_disposition)
+        cache_key = (document_id, thumbnail)
+        cached = self._etag_get(cache_key)
+        if cached is not None:
+            headers = {**headers, "If-None-Match": cached[0]}
+
+        response = self.session.get(endpoint, headers=headers, params=params, stream=True)
+        if cached is not None and response.status_code == 304:
+            response.close()
+            # Every caller gets its own Blob (and file cursor) over the cached bytes
+            content, file_name, content_type = cached[1]
+            return Blob(
+                id=document_id,
+                file_name=file_name,
+                content_type=content_type,
+                content=content,
+            )
+
+        blob = self._download_blob(response, document_id)
+
+        # Only small documents are kept; large ones would pin their spool in memory
+        etag = response.headers.get("ETag")
+        if etag and blob.size <= self.ETAG_CACHE_MAX_DOCUMENT_SIZE:
+            self._etag_put(
+                cache_key, etag, (blob.content, blob.file_name, blob.content_type)
+            )
+
+        return blob
+
+    def fetch_documents(
+        self, document_ids: Iterable[uuid.UUID], thumbnail: bool = False
+    ) -> List[Union[Blob, Exception]]:
+        """Fetch many documents concurrently while respecting per-host limits.
+
+        At most `MAX_CONCURRENT_DOWNLOADS` downloads are in flight and no more than
+        `DOWNLOADS_PER_SECOND` are started per second.
 
-        return Blob(
-            id=document_id,
-            file_name=filename,
-            content_type=response.headers.get(
-                "Content-Type", "application/octet-stream"
-            ),
-            content=response.content,
-        )
+        Args:
+            document_ids: The UUIDs of the documents to fetch.
+            thumbnail: Whether to fetch the thumbnail versions.
+        Returns:
+            One entry per id in input order: the `Blob`, or the exception raised
+            while fetching it. A failed document does not abort the batch.
+        """
+        document_ids = list(document_ids)
+        if not document_ids:
+            return []
+
+        workers = min(self.MAX_CONCURRENT_DOWNLOADS, len(document_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._fetch_document_throttled, document_id, thumbnail)
+                for document_id in document_ids
+            ]
+
+        results: List[Union[Blob, Exception]] = []
+        for future in futures:
+            error = future.exception()
+            results.append(future.result() if error is None else error)
+
+        return results
+
+    def _fetch_document_throttled(self, document_id: uuid.UUID, thumbnail: bool) -> Blob:
+        """Fetch a document once the rate limiter and host semaphore allow it."""
+        self._rate_limiter.acquire()
+        with self._host_sem:
+            return self.fetch_document(document_id, thumbnail=thumbnail)
 
     def export_photos(
         self,
@@ -191,30 +385,19 @@ class Client:
             task_types: List of task types to filter by.
 
         Returns:
-            The exported photos content as archive bytes.
+            The exported photos archive as a `Blob` spooled from the streamed response.
         """
 
         endpoint = f"{self.credentials.base_url}/cm/campaigns/{campaign_id}/installationprogresssummary/photos"
         headers = self.credentials.authorization_header
-        params = {"all": str(all).lower()}
-        payload = {
-            "locations": locations or [],
-            "cmCarriers": cm_carriers or [],
-            "components": components or [],
-            "taskTypes": task_types or [],
-        }
-        response = self.session.post(endpoint, headers=headers, params=params, json=payload)
-
-        response.raise_for_status()
-
-        content_disposition = response.headers.get("Content-Disposition", "")
-        filename = self._extract_filename(content_disposition)
-
-        return Blob(
-            id=campaign_id,
-            file_name=filename,
-            content_type=response.headers.get(
-                "Content-Type", "application/octet-stream"
-            ),
-            content=response.content,
+        params = {"all": "true" if all else "false"}
+        body = filter_body(locations, cm_carriers, components, task_types)
+        response = self.session.post(
+            endpoint,
+            headers={**headers, **JSON_CONTENT_TYPE},
+            params=params,
+            data=body,
+            stream=True,
         )
+
+        return self._download_blob(response, campaign_id)
@@ -6,23 +6,56 @@ Handles authentication, token storage, and automatic token refreshing.
 from __future__ import annotations
 
 import datetime as _dt
+import hashlib
 import logging
+import threading
 import time
 import os
-from typing import Any, Dict, Optional
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .errors import CredentialsError
 
+try:  # Optional C parser for ISO 8601 expiry timestamps
+    import ciso8601
+except ImportError:  # pragma: no cover - depends on installed extras
+    ciso8601 = None
+
+if TYPE_CHECKING:
+    from .http2 import HTTP2Session
+
 # Configure a logger for this module
 logger = logging.getLogger(__name__)
 
+# datetime.fromisoformat accepts any ISO 8601 string (incl. 'Z') from Python 3.11
+_FULL_FROMISOFORMAT = sys.version_info >= (3, 11)
+# Fallback for older versions, e.g. 7-digit fractions as emitted by .NET backends
+# (time components are optional, as they are for fromisoformat)
+_ISO_RE = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})"
+    r"(?:[T ](\d{2})(?::(\d{2})(?::(\d{2})(?:\.(\d+))?)?)?(Z|[+-]\d{2}:?\d{2})?)?"
+)
+
 
 class Credentials:
     # Constants for configuration
     DEFAULT_TIMEOUT = 15
     DEFAULT_TOKEN_TTL = 3000  # Fallback duration in seconds
     CLOCK_SKEW = 30  # Buffer seconds to refresh before actual expiry
+    POOL_CONNECTIONS = 16  # Number of per-host connection pools to cache
+    POOL_MAXSIZE = 64  # Connections kept alive per host
+    MAX_RETRIES = 3  # Retries on transient gateway errors
+    RETRY_BACKOFF = 0.3  # Backoff factor in seconds between retries
+    RETRY_STATUSES = (502, 503, 504)
+    EXPIRES_IN_KEYS = ("expires_in", "expiresIn")  # Token lifetime in seconds
+    EXPIRES_AT_KEYS = ("expires_at", "expiresAt")  # Absolute ISO 8601 expiry
 
     def __init__(
         self,
@@ -32,6 +65,9 @@ class Credentials:
         base_url: str = "https://pos-core.pos-media.eu/gate/api/v1",
         session: Optional[requests.Session] = None,
         token_ttl_fallback: int = DEFAULT_TOKEN_TTL,
+        http2: bool = False,
+        token_cache_dir: Optional[Union[str, Path]] = None,
+        prefetch_token: bool = False,
     ) -> None:
         """
         Initialize the credential manager.
@@ -40,9 +76,23 @@ class Credentials:
             username: POS Media account username.
             password: POS Media account password.
             base_url: API base URL (up to the `/account` segment).
-            session: Optional `requests.Session` to reuse connections.
+            session: Optional `requests.Session` to reuse connections. When omitted,
+                     a session with a tuned connection pool and retries on
+                     transient gateway errors is created.
             token_ttl_fallback: Seconds to assume a token is valid if the API
                                 does not return an expiration time.
+            http2: Whether the default session should use HTTP/2 via `httpx`
+                   (requires the `http2` extra). Ignored when `session` is given.
+                   The HTTP/2 session does not retry: the `MAX_RETRIES` / `RETRY_BACKOFF`
+                   policy only applies to the default `requests` session.
+            token_cache_dir: Optional directory to persist tokens in, so a new process
+                             can reuse a still valid token instead of logging in again.
+                             Files are keyed by username and base URL and written with
+                             owner-only permissions.
+            prefetch_token: Whether to log in on a background thread right away, so the
+                            TLS handshake and login overlap with the caller's own setup.
+                            The first `bearer_token` access waits for it; a failed
+                            prefetch is retried (and raised) there.
         """
         self.username = username
         self.password = password
@@ -50,32 +100,96 @@ class Credentials:
         self.token_ttl_fallback = token_ttl_fallback
 
         # Reuse existing session or create a new one
-        self.session = session or requests.Session()
+        if session is None:
+            session = self._create_http2_session() if http2 else self._create_session()
+        self.session = session
 
         # Internal state
         self._token: Optional[str] = None
         self._refresh_token: Optional[str] = None
         self._token_expires_at: float = 0.0
+        self._authorization_header: Dict[str, str] = {}
+        # Serializes login/refresh so concurrent callers share a single round-trip
+        self._refresh_lock = threading.Lock()
+
+        self._token_cache_file: Optional[Path] = None
+        if token_cache_dir is not None:
+            key = hashlib.sha256(f"{self.username}\0{self.base_url}".encode()).hexdigest()
+            self._token_cache_file = Path(token_cache_dir) / f"{key[:32]}.json"
+            self._load_cached_tokens()
+
+        if prefetch_token and not self._token:
+            threading.Thread(
+                target=self._prefetch_token, name="poscore-token-prefetch", daemon=True
+            ).start()
+
+    @classmethod
+    def _create_session(cls) -> requests.Session:
+        """Create a session with a sized connection pool and retry policy."""
+        retry = Retry(
+            total=cls.MAX_RETRIES,
+            backoff_factor=cls.RETRY_BACKOFF,
+            status_forcelist=cls.RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "POST"]),
+            # Hand the last response back so callers surface it via raise_for_status()
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=cls.POOL_CONNECTIONS,
+            pool_maxsize=cls.POOL_MAXSIZE,
+            max_retries=retry,
+        )
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    @staticmethod
+    def _create_http2_session() -> HTTP2Session:
+        """Create an HTTP/2 session multiplexing requests over shared connections."""
+        # Imported lazily as httpx is an optional dependency
+        from .http2 import HTTP2Session
+
+        return HTTP2Session()
 
     @property
     def bearer_token(self) -> str:
         """
         Returns a valid bearer token.
-        Automatically logs in or refreshes the token if it is expired.
+        Automatically logs in or refreshes the token if it is expired; concurrent
+        callers wait for a single login/refresh instead of issuing their own.
         """
-        if not self._token:
-            logger.info("No token found. Authenticating...")
-            self._authenticate()
-        elif self._is_expired():
-            logger.info("Token expired. Refreshing...")
-            self.refresh()
+        if not self._token or self._is_expired():
+            with self._refresh_lock:
+                # Another thread may have renewed the token while we waited
+                if not self._token:
+                    logger.info("No token found. Authenticating...")
+                    self._authenticate()
+                elif self._is_expired():
+                    logger.info("Token expired. Refreshing...")
+                    self.refresh()
 
         return self._token or ""
 
+    def _prefetch_token(self) -> None:
+        """Log in ahead of the first request; errors resurface on the next access."""
+        try:
+            _ = self.bearer_token
+        except CredentialsError as err:
+            logger.warning(f"Token prefetch failed: {err}")
+
     @property
     def authorization_header(self) -> Dict[str, str]:
-        """Returns the standard Authorization header dictionary."""
-        return {"Authorization": f"Bearer {self.bearer_token}"}
+        """
+        Returns the standard Authorization header dictionary.
+        The dictionary is built once per token and shared; do not mutate it.
+        """
+        if not self._token or self._is_expired():
+            _ = self.bearer_token
+
+        return self._authorization_header
 
     def refresh(self) -> None:
         """
@@ -110,9 +224,9 @@ class Credentials:
                 self._authenticate()
                 return
 
-            self._update_tokens(response.json())
+            self._update_tokens(orjson.loads(response.content))
 
-        except requests.RequestException as err:
+        except (requests.RequestException, orjson.JSONDecodeError) as err:
             logger.error(f"Network error during refresh: {err}")
             # Depending on business logic, you might want to raise here or try _authenticate
             raise CredentialsError(f"Failed to refresh token: {err}") from err
@@ -134,10 +248,10 @@ class Credentials:
                 endpoint, json=payload, headers=headers, timeout=self.DEFAULT_TIMEOUT
             )
             response.raise_for_status()
-            self._update_tokens(response.json())
+            self._update_tokens(orjson.loads(response.content))
             logger.info("Authentication successful.")
 
-        except requests.RequestException as err:
+        except (requests.RequestException, orjson.JSONDecodeError) as err:
             logger.error(f"Authentication failed: {err}")
             raise CredentialsError(
                 f"Login failed for user '{self.username}': {err}"
@@ -157,30 +271,125 @@ class Credentials:
 
         self._token = token
         self._refresh_token = refresh_token
+        self._authorization_header = {"Authorization": f"Bearer {token}"}
 
-        # Calculate expiry
-        expiry_ts = self._extract_expiry_timestamp(payload)
+        # Calculate expiry from a single clock reading
+        now = time.time()
+        expiry_ts = self._extract_expiry_timestamp(payload, now)
         if expiry_ts:
             self._token_expires_at = expiry_ts
         else:
-            self._token_expires_at = time.time() + self.token_ttl_fallback
+            self._token_expires_at = now + self.token_ttl_fallback
+
+        self._store_cached_tokens()
+
+    def _load_cached_tokens(self) -> None:
+        """Restore tokens persisted by a previous process if they are still valid."""
+        try:
+            cached = orjson.loads(self._token_cache_file.read_bytes())
+        except FileNotFoundError:
+            return
+        except (OSError, orjson.JSONDecodeError) as err:
+            logger.warning(f"Ignoring unreadable token cache: {err}")
+            return
+        if not isinstance(cached, dict):
+            logger.warning("Ignoring malformed token cache")
+            return
+
+        expires_at = cached.get("expiresAt")
+        if not cached.get("accessToken") or not isinstance(expires_at, (int, float)):
+            return
+        if time.time() >= expires_at - self.CLOCK_SKEW:
+            return
+
+        self._token = cached["accessToken"]
+        self._refresh_token = cached.get("refreshToken")
+        self._token_expires_at = float(expires_at)
+        self._authorization_header = {"Authorization": f"Bearer {self._token}"}
+        logger.info("Reusing cached token.")
+
+    def _store_cached_tokens(self) -> None:
+        """Atomically persist the current tokens with owner-only permissions."""
+        if self._token_cache_file is None:
+            return
+
+        data = orjson.dumps(
+            {
+                "accessToken": self._token,
+                "refreshToken": self._refresh_token,
+                "expiresAt": self._token_expires_at,
+            }
+        )
 
-    def _extract_expiry_timestamp(self, payload: Dict[str, Any]) -> Optional[float]:
+        try:
+            self._token_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # mkstemp creates the file with 0600 permissions
+            fd, tmp_path = tempfile.mkstemp(dir=self._token_cache_file.parent)
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    fh.write(data)
+                os.replace(tmp_path, self._token_cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as err:
+            # A failing cache must not break authentication
+            logger.warning(f"Failed to persist token cache: {err}")
+
+    def _extract_expiry_timestamp(
+        self, payload: Dict[str, Any], now: float
+    ) -> Optional[float]:
         """Helper to find expiration in payload (seconds duration or ISO timestamp)."""
-        # 1. Try "expires_in" (duration in seconds)
-        expires_in = payload.get("expires_in") or payload.get("expiresIn")
-        if isinstance(expires_in, (int, float)):
-            return time.time() + float(expires_in)
+        # 1. Try "expires_in" (duration in seconds); 0 and other falsy values mean unknown
+        for key in self.EXPIRES_IN_KEYS:
+            expires_in = payload.get(key)
+            if expires_in and isinstance(expires_in, (int, float)):
+                return now + float(expires_in)
 
         # 2. Try "expires_at" (ISO 8601 string)
-        expires_at = payload.get("expires_at") or payload.get("expiresAt")
-        if isinstance(expires_at, str):
+        for key in self.EXPIRES_AT_KEYS:
+            expires_at = payload.get(key)
+            if not expires_at or not isinstance(expires_at, str):
+                continue
             try:
-                # Handle 'Z' for UTC if present
-                clean_ts = expires_at.replace("Z", "+00:00")
-                dt = _dt.datetime.fromisoformat(clean_ts)
-                return dt.timestamp()
+                if ciso8601 is not None:
+                    return ciso8601.parse_datetime(expires_at).timestamp()
+
+                return self._parse_iso_timestamp(expires_at)
             except ValueError:
                 logger.warning(f"Failed to parse expiry timestamp: {expires_at}")
 
         return None
+
+    @staticmethod
+    def _parse_iso_timestamp(value: str) -> float:
+        """Parse an ISO 8601 timestamp into a POSIX timestamp (raises ValueError)."""
+        if _FULL_FROMISOFORMAT:
+            return _dt.datetime.fromisoformat(value).timestamp()
+
+        match = _ISO_RE.fullmatch(value)
+        if match is None:
+            raise ValueError(f"Invalid ISO 8601 timestamp: {value!r}")
+
+        year, month, day, hour, minute, second, fraction, offset = match.groups()
+        tz = None
+        if offset == "Z":
+            tz = _dt.timezone.utc
+        elif offset:
+            sign = -1 if offset[0] == "-" else 1
+            digits = offset[1:].replace(":", "")
+            tz = _dt.timezone(
+                sign * _dt.timedelta(hours=int(digits[:2]), minutes=int(digits[2:]))
+            )
+
+        dt = _dt.datetime(
+            int(year),
+            int(month),
+            int(day),
+            int(hour or 0),
+            int(minute or 0),
+            int(second or 0),
+            int((fraction or "0")[:6].ljust(6, "0")),
+            tzinfo=tz,
+        )
+        return dt.timestamp()
@@ -0,0 +1,149 @@
+"""
+HTTP/2 transport for POS Media Data Core built on `httpx`.
+Exposes the subset of the `requests.Session` interface used by `Credentials` and `Client`,
+so concurrent page and document requests can be multiplexed over a single connection.
+Unlike the default `requests` session of `Credentials`, failed requests are not retried.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from ._common import MAX_CONNECTIONS, MAX_KEEPALIVE_CONNECTIONS
+
+
+def _to_requests_error(err: httpx.HTTPError) -> requests.RequestException:
+    """Map an httpx transport error to the matching `requests` exception."""
+    if isinstance(err, httpx.TimeoutException):
+        return requests.Timeout(str(err))
+
+    return requests.ConnectionError(str(err))
+
+
+class _StreamReader:
+    """File-like view of a streamed `httpx.Response`, used as `requests.Response.raw`."""
+
+    def __init__(self, response: httpx.Response) -> None:
+        self._response = response
+        self._chunks = response.iter_bytes()
+        self._buffer = bytearray()
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        """Read up to `amt` decoded bytes (everything left when `amt` is None)."""
+        while amt is None or len(self._buffer) < amt:
+            try:
+                chunk = next(self._chunks, None)
+            except httpx.HTTPError as err:
+                raise _to_requests_error(err) from err
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if amt is None:
+            amt = len(self._buffer)
+        data = bytes(self._buffer[:amt])
+        del self._buffer[:amt]
+
+        return data
+
+    def close(self) -> None:
+        """Close the underlying response and return its stream to the pool."""
+        self._response.close()
+
+
+class HTTP2Session:
+    def __init__(self, client: Optional[httpx.Client] = None) -> None:
+        """
+        Initialize the HTTP/2 session.
+
+        Args:
+            client: Optional `httpx.Client` to send requests with. When omitted,
+                    an HTTP/2 client with pooled keep-alive connections is created.
+        """
+        self.client = client or httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            # Match requests, which follows redirects and does not time out unless asked to
+            follow_redirects=True,
+            timeout=None,
+        )
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request; accepts the same keyword arguments as `request`."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a POST request; accepts the same keyword arguments as `request`."""
+        return self.request("POST", url, **kwargs)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        json: Any = None,
+        data: Any = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Send a request and return it as a `requests.Response`.
+
+        Transport errors are re-raised as `requests.RequestException` subclasses,
+        so callers handle both transports the same way.
+        """
+        body: Dict[str, Any] = {}
+        if isinstance(data, (bytes, str)):
+            body["content"] = data
+        elif data is not None:
+            body["data"] = data
+
+        request = self.client.build_request(
+            method,
+            url,
+            params=params,
+            headers=headers,
+            json=json,
+            timeout=timeout,
+            **body,
+        )
+
+        try:
+            response = self.client.send(request, stream=stream)
+        except httpx.HTTPError as err:
+            raise _to_requests_error(err) from err
+
+        return self._to_requests_response(response, stream)
+
+    @staticmethod
+    def _to_requests_response(response: httpx.Response, stream: bool) -> requests.Response:
+        """Wrap an `httpx.Response` into a `requests.Response`."""
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.headers = CaseInsensitiveDict(response.headers)
+        result.url = str(response.url)
+        result.reason = response.reason_phrase
+        result.encoding = get_encoding_from_headers(result.headers)
+
+        if stream:
+            # Body is read lazily through iter_content() and released by close()
+            result.raw = _StreamReader(response)
+        else:
+            result._content = response.content
+            result._content_consumed = True
+
+        return result
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.client.close()
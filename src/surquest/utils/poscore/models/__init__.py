@@ -1,15 +1,41 @@
-from .blobs.blob import Blob
-from .campaigns import Campaign
-from .installations.installation_response import InstallationResponse
-from .installations.installation_status_payload import InstallationStatusPayload
-from .campaigns.campaign_response import CampaignResponse
-from .campaigns.contact import Contact
-
-all = [
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .blobs.blob import Blob
+    from .campaigns import Campaign
+    from .installations.installation_response import InstallationResponse
+    from .installations.installation_status_payload import InstallationStatusPayload
+    from .campaigns.campaign_response import CampaignResponse
+    from .campaigns.contact import Contact
+
+# Models are imported on first access so that e.g. document downloads
+# do not pay for building the whole campaign model graph
+_LAZY_IMPORTS = {
+    "Blob": ".blobs.blob",
+    "Campaign": ".campaigns",
+    "InstallationResponse": ".installations.installation_response",
+    "InstallationStatusPayload": ".installations.installation_status_payload",
+    "CampaignResponse": ".campaigns.campaign_response",
+    "Contact": ".campaigns.contact",
+}
+
+__all__ = [
     "Blob",
     "Campaign",
     "InstallationResponse",
     "InstallationStatusPayload",
     "CampaignResponse",
     "Contact",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module, __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
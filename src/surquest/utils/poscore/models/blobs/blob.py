@@ -1,16 +1,154 @@
 from __future__ import annotations
-from pydantic import BaseModel, computed_field
+from tempfile import SpooledTemporaryFile
+from itertools import zip_longest
+from typing import Any, ClassVar, Iterable, Iterator, Optional
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    ValidationInfo,
+    computed_field,
+    model_validator,
+)
+import base64
+import io
 import uuid
 
 
 class Blob(BaseModel):
+    """Binary payload downloaded from the API.
+
+    The content is held in a spooled temporary file: small payloads stay in
+    memory, large archives roll over to disk once they exceed `SPOOL_MAX_SIZE`.
+    Close the blob (or use it as a context manager) to release that file.
+
+    Serializing includes the whole `content` (base64 in JSON), and two blobs are
+    equal when their metadata and content are equal.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, ser_json_bytes="base64")
+
+    CHUNK_SIZE: ClassVar[int] = 1 << 16
+    SPOOL_MAX_SIZE: ClassVar[int] = 1 << 24
+
     id: str | int | uuid.UUID
     file_name: str
     content_type: str
-    content: bytes
+    content_length: Optional[int] = None
+    file: Any = Field(default=None, exclude=True, repr=False)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _wrap_content(cls, data: Any, info: ValidationInfo) -> Any:
+        """Accept in-memory `content` in place of a file object.
+
+        Bytes, bytearray and memoryview are used as-is and a string is UTF-8
+        encoded. When validating JSON, a string is the URL-safe base64 form
+        produced by `model_dump_json`.
+        """
+        if not isinstance(data, dict):
+            return data
+
+        if "content" in data:
+            data = dict(data)
+            content = data.pop("content")
+            if isinstance(content, str):
+                if info.mode == "json":
+                    content = base64.urlsafe_b64decode(content)
+                else:
+                    content = content.encode()
+            # BytesIO shares an immutable bytes buffer instead of copying it
+            data["file"] = io.BytesIO(content)
+        elif data.get("file") is None:
+            raise ValueError("Either content or file is required")
+
+        return data
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[bytes], **kwargs: Any) -> "Blob":
+        """Build a blob by spooling an iterable of byte chunks.
+
+        Args:
+            chunks: Byte chunks, e.g. `response.iter_content(...)`.
+            **kwargs: Remaining `Blob` fields (id, file_name, content_type, ...).
+        """
+        spool = cls.spool()
+        for chunk in chunks:
+            spool.write(chunk)
+        spool.seek(0)
+
+        return cls(file=spool, **kwargs)
+
+    @classmethod
+    def spool(cls) -> SpooledTemporaryFile:
+        """Return an empty spooled temporary file sized for blob content."""
+        return SpooledTemporaryFile(max_size=cls.SPOOL_MAX_SIZE)
+
+    @computed_field(repr=False)
+    @property
+    def content(self) -> bytes:
+        """The whole content as bytes (reads the spooled file into memory)."""
+        self.file.seek(0)
+        return self.file.read()
+
+    def view(self) -> memoryview:
+        """A read-only view of the content.
+
+        Blobs built from in-memory `content` are exposed without copying;
+        spooled downloads are read once. The view does not pin the underlying
+        file, so the blob can still be closed while the view is in use.
+        """
+        if isinstance(self.file, io.BytesIO):
+            # getvalue() hands out the shared immutable buffer, not an export of it
+            return memoryview(self.file.getvalue())
+
+        return memoryview(self.content)
+
+    def stream(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the content in chunks without loading all of it into memory."""
+        self.file.seek(0)
+        while True:
+            chunk = self.file.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
 
     @computed_field
     @property
     def size(self) -> int:
         """Size of the content in bytes."""
-        return len(self.content)
+        if self.content_length is not None:
+            return self.content_length
+
+        position = self.file.tell()
+        size = self.file.seek(0, io.SEEK_END)
+        self.file.seek(position)
+
+        return size
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Blob):
+            return NotImplemented
+        if self is other:
+            return True
+        if (self.id, self.file_name, self.content_type, self.size) != (
+            other.id,
+            other.file_name,
+            other.content_type,
+            other.size,
+        ):
+            return False
+
+        # Compare chunk by chunk so large spooled files are not loaded whole
+        return all(a == b for a, b in zip_longest(self.stream(), other.stream()))
+
+    def close(self) -> None:
+        """Close the underlying file, deleting it if it was rolled over to disk."""
+        if self.file is not None:
+            self.file.close()
+
+    def __enter__(self) -> "Blob":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -1,14 +1,30 @@
 from __future__ import annotations
-from typing import List
+from typing import ClassVar, Iterator, List, Tuple
 from pydantic import BaseModel
 from .location_installation import LocationInstallation
 
 
 class InstallationStatusPayload(BaseModel):
     """The top-level object categorizing locations by their installation state."""
+
+    CATEGORIES: ClassVar[Tuple[str, ...]] = (
+        "inProgress",
+        "pendingReview",
+        "partiallyInstalled",
+        "unsuccessful",
+        "installed",
+        "missed",
+    )
+
     inProgress: List[LocationInstallation] = []
     pendingReview: List[LocationInstallation] = []
     partiallyInstalled: List[LocationInstallation] = []
     unsuccessful: List[LocationInstallation] = []
     installed: List[LocationInstallation] = []
     missed: List[LocationInstallation] = []
+
+    def iter_all(self) -> Iterator[Tuple[str, LocationInstallation]]:
+        """Yield `(category, location)` for every location, regardless of its state."""
+        for category in self.CATEGORIES:
+            for location in getattr(self, category):
+                yield category, location
@@ -0,0 +1,48 @@
+import json
+import os
+
+import pytest
+
+from surquest.utils.poscore.client import Client
+from surquest.utils.poscore.credentials import Credentials
+
+
+@pytest.fixture(scope="session")
+def poscore_login():
+    """Username and password parsed once from POSCORE_CREDENTIALS."""
+    creds_json = os.environ.get("POSCORE_CREDENTIALS")
+    if not creds_json:
+        pytest.skip("POSCORE_CREDENTIALS environment variable not set")
+
+    try:
+        creds = json.loads(creds_json)
+    except json.JSONDecodeError:
+        pytest.fail("POSCORE_CREDENTIALS must be a valid JSON string")
+
+    username = next(iter(creds), None)
+    password = creds[username] if username else None
+    if not username or not password:
+        pytest.fail("POSCORE_CREDENTIALS must contain 'username' and 'password'")
+
+    return username, password
+
+
+@pytest.fixture(scope="session")
+def poscore_credentials(poscore_login):
+    """Logged-in credentials shared by the whole suite, so its keep-alive session is reused."""
+    creds = Credentials(*poscore_login)
+    _ = creds.bearer_token
+    return creds
+
+
+@pytest.fixture(scope="class")
+def login_class(request, poscore_login):
+    """Expose the raw login on a test class as `username` and `password`."""
+    request.cls.username, request.cls.password = poscore_login
+
+
+@pytest.fixture(scope="class")
+def client_class(request, poscore_credentials):
+    """Expose the shared credentials and a client on a test class as `creds` and `client`."""
+    request.cls.creds = poscore_credentials
+    request.cls.client = Client(poscore_credentials)
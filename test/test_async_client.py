@@ -0,0 +1,78 @@
+import asyncio
+import json
+import unittest
+import uuid
+
+import pytest
+
+# AsyncClient needs the optional `http2` extra
+httpx = pytest.importorskip("httpx")
+
+from surquest.utils.poscore.async_client import AsyncClient  # noqa: E402
+from surquest.utils.poscore.credentials import Credentials  # noqa: E402
+
+
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+
+    async def test_get_campaigns_bounds_concurrent_pages(self):
+        """Test that remaining pages are fetched at most MAX_CONCURRENT_PAGES at a time."""
+        page_count = AsyncClient.MAX_CONCURRENT_PAGES * 3
+        in_flight = []
+        peak = 0
+
+        async def handler(request):
+            nonlocal peak
+            in_flight.append(request)
+            peak = max(peak, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(request)
+
+            page = int(request.url.params["page"])
+            body = {
+                "currentPage": page,
+                "pageSize": 0,
+                "rowCount": 0,
+                "pageCount": page_count,
+                "data": [],
+            }
+            return httpx.Response(200, content=json.dumps(body).encode())
+
+        credentials = Credentials("user", "pass")
+        credentials._update_tokens({"accessToken": "token"})
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        async with AsyncClient(credentials, http_client=http_client) as client:
+            assert await client.get_campaigns() == []
+
+        assert peak == AsyncClient.MAX_CONCURRENT_PAGES
+
+
+@pytest.mark.usefixtures("client_class")
+class TestAsyncClientIntegration(unittest.IsolatedAsyncioTestCase):
+
+    async def test_get_campaigns_page_vs_all(self):
+        """Verify concurrent fetch_all collects at least as many items as a single page."""
+        async with AsyncClient(self.creds) as client:
+            page = await client.get_campaigns(size=5, fetch_all=False)
+            all_ = await client.get_campaigns(size=5, fetch_all=True)
+
+        assert len(page) <= 5
+        assert len(all_) >= len(page)
+
+    async def test_get_campaigns_installations(self):
+        """Test fetching campaign installations summary."""
+        async with AsyncClient(self.creds) as client:
+            result = await client.get_campaign_installations(campaign_id=6737)
+
+        assert result is not None
+
+    async def test_fetch_documents_batch(self):
+        """Test batched document fetching keeps order and reports failures in place."""
+        document_id = uuid.UUID("e627e4e7-c5e5-4cbb-ae3a-56ccd7873c5d")
+        missing_id = uuid.UUID("00000000-0000-0000-0000-000000000000")
+        async with AsyncClient(self.creds) as client:
+            results = await client.fetch_documents([document_id, missing_id])
+
+        assert results[0].id == document_id
+        assert len(results[0].content) > 15000
+        assert isinstance(results[1], Exception)
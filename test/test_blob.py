@@ -0,0 +1,61 @@
+import unittest
+
+from pydantic import ValidationError
+
+from surquest.utils.poscore.models import Blob
+
+
+class TestBlob(unittest.TestCase):
+
+    def test_equality_compares_content(self):
+        """Test that blobs with the same metadata and bytes compare equal."""
+        a = Blob(id=1, file_name="a.bin", content_type="application/octet-stream", content=b"abc")
+        b = Blob.from_chunks(
+            [b"a", b"bc"], id=1, file_name="a.bin", content_type="application/octet-stream"
+        )
+        c = Blob(id=1, file_name="a.bin", content_type="application/octet-stream", content=b"abd")
+
+        assert a == b
+        assert a != c
+
+    def test_serialization_keeps_content(self):
+        """Test that dumps include the content and JSON round-trips."""
+        blob = Blob(id=1, file_name="a.bin", content_type="image/jpeg", content=b"\xff\xd8\x00")
+
+        assert blob.model_dump()["content"] == b"\xff\xd8\x00"
+        assert Blob.model_validate_json(blob.model_dump_json()) == blob
+
+    def test_close_spooled_file(self):
+        """Test that a rolled-over blob closes its temporary file on context exit."""
+        chunks = [b"x" * Blob.CHUNK_SIZE] * (Blob.SPOOL_MAX_SIZE // Blob.CHUNK_SIZE + 1)
+        with Blob.from_chunks(chunks, id=1, file_name="a.bin", content_type="x") as blob:
+            assert blob.size == Blob.SPOOL_MAX_SIZE + Blob.CHUNK_SIZE
+
+        assert blob.file.closed
+
+    def test_close_after_view(self):
+        """Test that a blob can be closed while a view of its content is alive."""
+        for blob in (
+            Blob(id=1, file_name="a.bin", content_type="x", content=b"abc"),
+            Blob.from_chunks([b"a", b"bc"], id=1, file_name="a.bin", content_type="x"),
+        ):
+            with self.subTest(file=type(blob.file).__name__):
+                with blob:
+                    view = blob.view()
+
+                assert view.readonly
+                assert view.tobytes() == b"abc"
+
+    def test_content_or_file_is_required(self):
+        """Test that a blob without content or file is rejected."""
+        with self.assertRaises(ValidationError):
+            Blob(id=1, file_name="a.bin", content_type="x")
+        with self.assertRaises(ValidationError):
+            Blob(id=1, file_name="a.bin", content_type="x", file=None)
+
+    def test_str_content(self):
+        """Test that str content is UTF-8 encoded, and only base64 decoded from JSON."""
+        blob = Blob(id=1, file_name="a.txt", content_type="text/plain", content="hello")
+
+        assert blob.content == b"hello"
+        assert Blob.model_validate_json(blob.model_dump_json()).content == b"hello"
@@ -1,46 +1,241 @@
-import unittest
-import os
+import io
 import json
+import time
+import unittest
 import uuid
 
-from surquest.utils.poscore.credentials import Credentials
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from surquest.utils.poscore._common import extract_filename
 from surquest.utils.poscore.client import Client
+from surquest.utils.poscore.credentials import Credentials
 
+# Minimal campaign accepted by the Campaign model
+CAMPAIGN = {
+    "id": 1,
+    "name": "Campaign",
+    "created": "2026-01-01T00:00:00",
+    "from": "2026-01-01T00:00:00",
+    "to": "2026-02-01T00:00:00",
+    "currency": "EUR",
+    "campaignLocks": [],
+    "isCanceled": False,
+    "cmContactId": 1,
+    "companyId": 1,
+    "invCustomerId": 1,
+    "campCustomerId": 1,
+    "amSaleId": 1,
+    "invoiceStatus": 0,
+    "totalAmount": 0.0,
+    "campaignStatusValue": 0,
+    "limigoUseCustomerFrom": False,
+    "flags": [],
+    "useRetailerAutoApproval": False,
+}
 
-class TestClientIntegration(unittest.TestCase):
 
-    def setUp(self):
-        creds_json = os.environ.get("POSCORE_CREDENTIALS")
-        if not creds_json:
-            self.skipTest("POSCORE_CREDENTIALS environment variable not set")
+class MockAdapter(requests.adapters.BaseAdapter):
+    """Transport adapter answering every request with `handler(request)`."""
+
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        status, headers, body = self.handler(request)
+
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def mock_client(handler, client_class=Client):
+    """Create a logged-in client whose requests are answered by `handler`."""
+    adapter = MockAdapter(handler)
+    session = requests.Session()
+    session.mount("https://", adapter)
+
+    credentials = Credentials("user", "pass", session=session)
+    credentials._update_tokens({"accessToken": "token"})
+
+    return client_class(credentials), adapter
+
+
+class TestExtractFilename(unittest.TestCase):
+
+    def test_extended_form_takes_precedence(self):
+        """Test that filename* wins over the plain ASCII fallback."""
+        header = "attachment; filename=\"ascii.jpg\"; filename*=UTF-8''%C3%A9t%C3%A9.jpg"
+
+        assert extract_filename(header) == "\u00e9t\u00e9.jpg"
+
+    def test_extended_form_uses_declared_charset(self):
+        """Test that the charset'lang' prefix is removed and used for decoding."""
+        header = "attachment; filename*=iso-8859-1'en'%A3%20rates.pdf"
+
+        assert extract_filename(header) == "\u00a3 rates.pdf"
+
+    def test_plain_and_missing_filename(self):
+        """Test the quoted plain form and the fallback for headers without a filename."""
+        assert extract_filename('attachment; filename="a b.jpg"') == "a b.jpg"
+        assert extract_filename("inline") == "unknown"
+        assert extract_filename("") == "unknown"
+
+
+class TestConditionalRequests(unittest.TestCase):
+
+    @staticmethod
+    def etag_handler(body, headers=None):
+        """Answer with `body` and an ETag, or 304 when the request carries that ETag."""
+
+        def handler(request):
+            etag = f'"{request.path_url}"'
+            if request.headers.get("If-None-Match") == etag:
+                return 304, {"ETag": etag}, b""
+            return 200, {"ETag": etag, **(headers or {})}, body
+
+        return handler
+
+    def test_not_modified_page_is_parsed_again(self):
+        """Test that a 304 page is rebuilt from the cached body, not shared."""
+        page = {
+            "currentPage": 0,
+            "pageSize": 1,
+            "rowCount": 1,
+            "pageCount": 1,
+            "data": [CAMPAIGN],
+        }
+        client, adapter = mock_client(self.etag_handler(json.dumps(page).encode()))
+
+        first = client.get_campaigns(size=1, fetch_all=False)
+        first[0].name = "mutated"
+        second = client.get_campaigns(size=1, fetch_all=False)
+
+        assert "If-None-Match" not in adapter.requests[0].headers
+        assert adapter.requests[1].headers["If-None-Match"]
+        assert second[0].name == "Campaign"
+        assert second[0] is not first[0]
+
+    def test_not_modified_document_is_a_fresh_blob(self):
+        """Test that every 304 yields its own Blob over the cached bytes."""
+        headers = {
+            "Content-Disposition": 'attachment; filename="a.jpg"',
+            "Content-Type": "image/jpeg",
+        }
+        client, adapter = mock_client(self.etag_handler(b"abc", headers))
+
+        first = client.fetch_document("d1")
+        second = client.fetch_document("d1")
+        third = client.fetch_document("d1")
+        second.close()
+
+        assert adapter.requests[1].headers["If-None-Match"]
+        assert first == third
+        assert third.file is not second.file
+        assert third.file_name == "a.jpg"
+        assert third.content_type == "image/jpeg"
+        assert third.content == b"abc"
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test that at most ETAG_CACHE_SIZE resources are remembered."""
+        client, adapter = mock_client(self.etag_handler(b"abc"))
+        client.ETAG_CACHE_SIZE = 2
 
-        try:
-            creds = json.loads(creds_json)
-            self.username = list(creds.keys())[0] if creds else None
-            self.password = list(creds.values())[0] if creds else None
-        except json.JSONDecodeError:
-            self.fail("POSCORE_CREDENTIALS must be a valid JSON string")
+        for document_id in ("d1", "d2", "d1", "d3", "d1", "d2"):
+            client.fetch_document(document_id)
 
-        if not self.username or not self.password:
-            self.fail("POSCORE_CREDENTIALS must contain 'username' and 'password'")
+        conditional = ["If-None-Match" in request.headers for request in adapter.requests]
+        # d2 is evicted by d3 since d1 was used more recently
+        assert conditional == [False, False, True, False, True, False]
+
+    def test_large_documents_are_not_cached(self):
+        """Test that documents above ETAG_CACHE_MAX_DOCUMENT_SIZE are always downloaded."""
+        client, adapter = mock_client(self.etag_handler(b"abc"))
+        client.ETAG_CACHE_MAX_DOCUMENT_SIZE = 2
+
+        client.fetch_document("d1")
+        blob = client.fetch_document("d1")
+
+        assert all("If-None-Match" not in request.headers for request in adapter.requests)
+        assert blob.content == b"abc"
+
+
+class TestFetchDocuments(unittest.TestCase):
+
+    class FastClient(Client):
+        DOWNLOADS_PER_SECOND = 20
+
+    @staticmethod
+    def handler(request):
+        """Answer with the document id as body, or 404 for the id 'missing'."""
+        document_id = request.path_url.split("?")[0].rsplit("/", 1)[-1]
+        if document_id == "missing":
+            return 404, {}, b""
+        return 200, {}, document_id.encode()
+
+    def test_results_in_input_order(self):
+        """Test that blobs and per-id errors are returned in input order."""
+        client, _ = mock_client(self.handler)
+        document_ids = [f"d{i}" for i in range(10)]
+        document_ids.insert(3, "missing")
+
+        results = client.fetch_documents(document_ids)
+
+        assert len(results) == len(document_ids)
+        assert isinstance(results[3], requests.HTTPError)
+        for document_id, result in zip(document_ids, results):
+            if document_id != "missing":
+                assert result.id == document_id
+                assert result.content == document_id.encode()
+
+    def test_rate_limit_after_burst(self):
+        """Test that downloads beyond the initial burst are spaced by the rate limit."""
+        started = []
+
+        def handler(request):
+            started.append(time.monotonic())
+            return self.handler(request)
+
+        client, _ = mock_client(handler, self.FastClient)
+        rate = self.FastClient.DOWNLOADS_PER_SECOND
+
+        client.fetch_documents([f"d{i}" for i in range(rate + 6)])
+
+        started.sort()
+        for i in range(rate, len(started)):
+            # Allow a little slack for timer resolution
+            assert started[i] - started[0] >= (i - rate + 1) / rate - 0.01
+
+        assert client.fetch_documents([]) == []
+
+
+@pytest.mark.usefixtures("client_class")
+class TestClientIntegration(unittest.TestCase):
+    # Known document used by the download tests
+    DOCUMENT_ID = uuid.UUID("e627e4e7-c5e5-4cbb-ae3a-56ccd7873c5d")
 
     def test_get_campaigns_big_page_size(self):
         """Test fetching campaigns with a large size parameter."""
-        creds = Credentials(self.username, self.password)
-        client = Client(creds)
-
-        campaigns = client.get_campaigns(size=99999, fetch_all=False)
+        campaigns = self.client.get_campaigns(size=99999, fetch_all=False)
 
         assert isinstance(campaigns, list)
         assert len(campaigns) <= 99999
 
     def test_get_campaigns_page_vs_all(self):
         """Verify fetch_all collects at least as many items as a single page."""
-        creds = Credentials(self.username, self.password)
-        client = Client(creds)
-
-        page = client.get_campaigns(size=5, fetch_all=False)
-        all_ = client.get_campaigns(size=5, fetch_all=True)
+        page = self.client.get_campaigns(size=5, fetch_all=False)
+        all_ = self.client.get_campaigns(size=5, fetch_all=True)
 
         assert isinstance(page, list)
         assert isinstance(all_, list)
@@ -49,71 +244,85 @@ class TestClientIntegration(unittest.TestCase):
 
     def test_get_campaigns_expand_toggle(self):
         """Call endpoint with expand True/False and ensure responses parse."""
-        creds = Credentials(self.username, self.password)
-        client = Client(creds)
-
-        r_true = client.get_campaigns(size=3, expand=True, fetch_all=False)
-        r_false = client.get_campaigns(size=3, expand=False, fetch_all=False)
+        r_true = self.client.get_campaigns(size=3, expand=True, fetch_all=False)
+        r_false = self.client.get_campaigns(size=3, expand=False, fetch_all=False)
 
         assert isinstance(r_true, list)
         assert isinstance(r_false, list)
 
     def test_get_campaigns_with_params(self):
         """Basic sanity-check when passing ordering and params."""
-        creds = Credentials(self.username, self.password)
-        client = Client(creds)
-
-        res = client.get_campaigns(size=2, orderby="created desc", fetch_all=False)
+        res = self.client.get_campaigns(size=2, orderby="created desc", fetch_all=False)
         assert isinstance(res, list)
 
+    def test_iter_campaigns_matches_get_campaigns(self):
+        """Verify lazy iteration yields the same campaigns as a full fetch."""
+        listed = self.client.get_campaigns(size=5, fetch_all=True)
+        iterated = list(self.client.iter_campaigns(size=5))
+
+        assert [c.id for c in iterated] == [c.id for c in listed]
+
     def test_get_campaigns_installations(self):
         """Test fetching campaign installations summary."""
-        creds = Credentials(self.username, self.password)
-        client = Client(creds)
-
         # Use a known campaign ID for testing; replace with a valid one.
         campaign_id = 6737
-        result = client.get_campaign_installations(campaign_id=campaign_id)
+        result = self.client.get_campaign_installations(campaign_id=campaign_id)
 
         assert result is not None
+        assert len(list(result.iter_all())) == sum(len(locations) for _, locations in result)
 
-    def test_fetch_document_full_size(self):
-        """Test fetching a document with full size."""
-        creds = Credentials(self.username, self.password)
-        client = Client(creds)
+    def test_get_campaigns_installations_raw(self):
+        """Test fetching the installations summary without model validation."""
+        campaign_id = 6737
+        raw = self.client.get_campaign_installations(campaign_id=campaign_id, validate=False)
 
-        # Document ID:
-        document_id = uuid.UUID("e627e4e7-c5e5-4cbb-ae3a-56ccd7873c5d")
-        blob = client.fetch_document(document_id=document_id, thumbnail=False)
+        assert isinstance(raw, dict)
+        assert isinstance(raw.get("installed", []), list)
 
-        assert isinstance(blob.content, bytes)
-        assert len(blob.content) > 15000  # Expecting a reasonably sized document
-        assert isinstance(blob.content_type, str)
-        assert isinstance(blob.file_name, str)
+    def test_fetch_document(self):
+        """Test fetching a document in full size and as a thumbnail."""
+        cases = [
+            (False, lambda size: size > 15000),  # Expecting a reasonably sized document
+            (True, lambda size: size < 15000),  # Expecting a smaller thumbnail
+        ]
+        for thumbnail, expected_size in cases:
+            with self.subTest(thumbnail=thumbnail):
+                blob = self.client.fetch_document(
+                    document_id=self.DOCUMENT_ID, thumbnail=thumbnail
+                )
 
-    def test_fetch_document_thumbnail(self):
-        """Test fetching a document thumbnail."""
-        creds = Credentials(self.username, self.password)
-        client = Client(creds)
+                assert isinstance(blob.content, bytes)
+                assert expected_size(len(blob.content))
+                assert isinstance(blob.content_type, str)
+                assert isinstance(blob.file_name, str)
 
-        # Document ID:
-        document_id = uuid.UUID("e627e4e7-c5e5-4cbb-ae3a-56ccd7873c5d")
-        payload = client.fetch_document(document_id=document_id, thumbnail=True)
+    def test_fetch_document_stream(self):
+        """Test that streamed chunks add up to the reported document size."""
+        blob = self.client.fetch_document(document_id=self.DOCUMENT_ID, thumbnail=False)
 
-        assert isinstance(payload.content, bytes)
-        assert len(payload.content) < 15000  # Expecting a smaller thumbnail
-        assert isinstance(payload.content_type, str)
-        assert isinstance(payload.file_name, str)
+        streamed = b"".join(blob.stream(chunk_size=4096))
 
+        assert len(streamed) == blob.size
+        assert streamed == blob.content
+        assert blob.view() == blob.content
+
+    def test_fetch_documents_batch(self):
+        """Test batched document fetching keeps order and reports failures in place."""
+        missing_id = uuid.UUID("00000000-0000-0000-0000-000000000000")
+        results = self.client.fetch_documents(
+            [self.DOCUMENT_ID, missing_id, self.DOCUMENT_ID]
+        )
+
+        assert len(results) == 3
+        assert results[0].id == self.DOCUMENT_ID
+        assert isinstance(results[1], Exception)
+        assert results[2].id == self.DOCUMENT_ID
 
     def test_export_photos(self):
         """Test exporting photos for a campaign."""
-        creds = Credentials(self.username, self.password)
-        client = Client(creds)
-
         # Use a known campaign ID for testing; replace with a valid one.
         campaign_id = 6695
-        blob = client.export_photos(
+        blob = self.client.export_photos(
             campaign_id=campaign_id,
             all=True
         )
@@ -1,30 +1,150 @@
 import unittest
-import os
-import json
 import time
 import requests
 import datetime
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
+import pytest
+
+from surquest.utils.poscore import credentials
 from surquest.utils.poscore.credentials import Credentials
 from surquest.utils.poscore.errors import CredentialsError
 
 
-class TestCredentialsIntegration(unittest.TestCase):
-
-    def setUp(self):
-        creds_json = os.environ.get("POSCORE_CREDENTIALS")
-        if not creds_json:
-            self.skipTest("POSCORE_CREDENTIALS environment variable not set")
-
-        try:
-            creds = json.loads(creds_json)
-            self.username = list(creds.keys())[0] if creds else None
-            self.password = list(creds.values())[0] if creds else None
-        except json.JSONDecodeError:
-            self.fail("POSCORE_CREDENTIALS must be a valid JSON string")
+class FakeSession(requests.Session):
+    """Session answering each POST with the next canned JSON payload."""
+
+    def __init__(self, *payloads):
+        super().__init__()
+        self.payloads = list(payloads)
+        self.calls = []
+
+    def post(self, url, *args, **kwargs):
+        self.calls.append(url)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(self.payloads.pop(0)).encode()
+        return response
+
+
+class TestCredentials(unittest.TestCase):
+
+    def test_token_cache_round_trip(self):
+        """Test that a persisted token is reused by a new instance without logging in."""
+        login = {"accessToken": "t1", "refreshToken": "r1", "expiresIn": 3600}
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            c = Credentials("user", "pass", session=FakeSession(login), token_cache_dir=cache_dir)
+            assert c.bearer_token == "t1"
+            if os.name == "posix":
+                assert c._token_cache_file.stat().st_mode & 0o777 == 0o600
+
+            session = FakeSession()
+            restored = Credentials("user", "pass", session=session, token_cache_dir=cache_dir)
+            assert restored.bearer_token == "t1"
+            assert restored._refresh_token == "r1"
+            assert abs(restored._token_expires_at - c._token_expires_at) < 1e-6
+            assert session.calls == []
+
+            other = Credentials("other", "pass", session=FakeSession(), token_cache_dir=cache_dir)
+            assert other._token is None
+
+    def test_expired_token_cache_is_ignored(self):
+        """Test that a cached token inside the clock skew window triggers a new login."""
+        login = {"accessToken": "t2", "refreshToken": "r2", "expiresIn": 3600}
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            c = Credentials("user", "pass", session=FakeSession(), token_cache_dir=cache_dir)
+            c._token_cache_file.write_bytes(
+                json.dumps(
+                    {"accessToken": "t1", "refreshToken": "r1", "expiresAt": time.time() + 1}
+                ).encode()
+            )
+
+            session = FakeSession(login)
+            restored = Credentials("user", "pass", session=session, token_cache_dir=cache_dir)
+            assert restored._token is None
+            assert restored.bearer_token == "t2"
+            assert len(session.calls) == 1
+
+    def test_default_session_adapter(self):
+        """Test that the default session mounts a pooled adapter with retries."""
+        c = Credentials("user", "pass")
+
+        adapter = c.session.get_adapter(c.base_url)
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == Credentials.POOL_MAXSIZE
+        assert adapter.max_retries.total == Credentials.MAX_RETRIES
+        assert adapter.max_retries.backoff_factor == Credentials.RETRY_BACKOFF
+        assert 503 in adapter.max_retries.status_forcelist
+
+        session = requests.Session()
+        c = Credentials("user", "pass", session=session)
+        assert c.session is session
+
+    def test_zero_expires_in_uses_fallback(self):
+        """Test that a zero expires_in is treated as unknown rather than already expired."""
+        c = Credentials("user", "pass", session=FakeSession(), token_ttl_fallback=600)
+
+        c._update_tokens({"accessToken": "t1", "expiresIn": 0})
+        assert abs(c._token_expires_at - (time.time() + 600)) < 5
+        assert not c._is_expired()
+
+        c._update_tokens({"accessToken": "t2", "expires_in": 0, "expiresIn": 1800})
+        assert abs(c._token_expires_at - (time.time() + 1800)) < 5
 
-        if not self.username or not self.password:
-            self.fail("POSCORE_CREDENTIALS must contain 'username' and 'password'")
+    def test_parse_iso_timestamp(self):
+        """Test ISO parsing with datetime.fromisoformat and with the regex fallback."""
+        utc = datetime.timezone.utc
+        cases = {
+            "2026-10-15T10:00:00Z": datetime.datetime(2026, 10, 15, 10, tzinfo=utc),
+            "2026-10-15T10:00:00.1234567+02:00": datetime.datetime(
+                2026, 10, 15, 8, 0, 0, 123456, tzinfo=utc
+            ),
+            "2026-10-15 10:30:15.5-0130": datetime.datetime(
+                2026, 10, 15, 12, 0, 15, 500000, tzinfo=utc
+            ),
+            "2026-10-15T10:00": datetime.datetime(2026, 10, 15, 10),
+            "2026-10-15": datetime.datetime(2026, 10, 15),
+        }
+
+        # Before Python 3.11 fromisoformat rejects 'Z' and 7-digit fractions
+        for full in (True, False) if sys.version_info >= (3, 11) else (False,):
+            with mock.patch.object(credentials, "_FULL_FROMISOFORMAT", full):
+                for value, expected in cases.items():
+                    with self.subTest(full=full, value=value):
+                        assert Credentials._parse_iso_timestamp(value) == expected.timestamp()
+
+                with self.subTest(full=full, value="invalid-date"):
+                    with self.assertRaises(ValueError):
+                        Credentials._parse_iso_timestamp("invalid-date")
+
+    def test_malformed_token_cache_is_ignored(self):
+        """Test that unreadable or malformed cache files do not break construction."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            c = Credentials("user", "pass", session=FakeSession(), token_cache_dir=cache_dir)
+
+            for content in (
+                b"[]",
+                b"not json",
+                b'"token"',
+                b'{"accessToken": "t", "expiresAt": "x"}',
+            ):
+                with self.subTest(content=content):
+                    c._token_cache_file.write_bytes(content)
+
+                    restored = Credentials(
+                        "user", "pass", session=FakeSession(), token_cache_dir=cache_dir
+                    )
+                    assert restored._token is None
+
+
+@pytest.mark.usefixtures("login_class")
+class TestCredentialsIntegration(unittest.TestCase):
 
     def test_token_expiry_trigger(self):
         """Test that expired token triggers refresh."""
@@ -43,6 +163,34 @@ class TestCredentialsIntegration(unittest.TestCase):
         assert new_token
         assert c._token_expires_at > time.time()
 
+    def test_concurrent_refresh_single_request(self):
+        """Test that concurrent callers on an expired token share one refresh."""
+        c = Credentials(self.username, self.password)
+        _ = c.bearer_token
+
+        calls = []
+        refresh = c.refresh
+
+        def counting_refresh():
+            calls.append(1)
+            refresh()
+
+        c.refresh = counting_refresh
+        c._token_expires_at = time.time() - 100
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            tokens = list(executor.map(lambda _: c.bearer_token, range(8)))
+
+        assert len(calls) == 1
+        assert all(tokens)
+
+    def test_prefetch_token(self):
+        """Test that a background prefetch is shared by the first token access."""
+        c = Credentials(self.username, self.password, prefetch_token=True)
+
+        assert c.bearer_token
+        assert c.authorization_header["Authorization"].startswith("Bearer ")
+
     def test_refresh_missing_tokens(self):
         """Test refresh with missing tokens triggers full login."""
         c = Credentials(self.username, self.password)
@@ -159,4 +307,32 @@ class TestCredentialsIntegration(unittest.TestCase):
 
         header = c.authorization_header
         assert "Authorization" in header
-        assert header["Authorization"].startswith("Bearer ")
\ No newline at end of file
+        assert header["Authorization"].startswith("Bearer ")
+
+        # The header is reused until the token rotates
+        assert c.authorization_header is header
+
+        c._update_tokens({"accessToken": "rotated", "refreshToken": "r1"})
+        assert c.authorization_header == {"Authorization": "Bearer rotated"}
+
+    def test_token_cache_dir_reuses_token(self):
+        """Test that a persisted token is reused without logging in again."""
+
+        class BrokenSession(requests.Session):
+            def post(self, *args, **kwargs):
+                raise requests.RequestException("Simulated network error")
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            c = Credentials(self.username, self.password, token_cache_dir=cache_dir)
+            token = c.bearer_token
+
+            restored = Credentials(
+                self.username,
+                self.password,
+                session=BrokenSession(),
+                token_cache_dir=cache_dir,
+            )
+            assert restored.bearer_token == token
+
+            other = Credentials("other_user", self.password, token_cache_dir=cache_dir)
+            assert other._token is None
@@ -0,0 +1,129 @@
+import unittest
+
+import pytest
+import requests
+
+httpx = pytest.importorskip("httpx")
+
+from surquest.utils.poscore.http2 import HTTP2Session  # noqa: E402
+
+
+class TestHTTP2Session(unittest.TestCase):
+
+    @staticmethod
+    def session(handler):
+        """Create a session answering every request with `handler`."""
+        return HTTP2Session(client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    def test_response_is_wrapped(self):
+        """Test that status, headers, url, encoding and body are copied to requests.Response."""
+
+        def handler(request):
+            return httpx.Response(
+                404,
+                headers={"Content-Type": "application/json; charset=utf-8", "ETag": '"1"'},
+                content=b'{"a": 1}',
+            )
+
+        response = self.session(handler).get("https://example.com/x", params={"page": 2})
+
+        assert isinstance(response, requests.Response)
+        assert response.status_code == 404
+        assert response.reason == "Not Found"
+        assert response.url == "https://example.com/x?page=2"
+        assert response.headers["etag"] == '"1"'
+        assert response.encoding == "utf-8"
+        assert response.json() == {"a": 1}
+        with self.assertRaises(requests.HTTPError):
+            response.raise_for_status()
+
+    def test_streamed_body(self):
+        """Test that a streamed body is read through iter_content() and the stream closed."""
+        body = bytes(range(256)) * 100
+
+        def handler(request):
+            return httpx.Response(200, stream=httpx.ByteStream(body))
+
+        response = self.session(handler).get("https://example.com/x", stream=True)
+        chunks = list(response.iter_content(1000))
+        response.close()
+
+        assert b"".join(chunks) == body
+        assert all(len(chunk) == 1000 for chunk in chunks[:-1])
+        assert response.raw._response.is_closed
+
+    def test_stream_reader_read(self):
+        """Test that read() honours amt and returns everything left without it."""
+
+        def handler(request):
+            return httpx.Response(200, content=b"abcdef")
+
+        reader = self.session(handler).get("https://example.com/x", stream=True).raw
+
+        assert reader.read(2) == b"ab"
+        assert reader.read() == b"cdef"
+        assert reader.read(2) == b""
+
+    def test_data_and_content(self):
+        """Test that raw bodies are sent as content and mappings as form data."""
+        seen = []
+
+        def handler(request):
+            seen.append((request.headers.get("Content-Type"), request.content))
+            return httpx.Response(200)
+
+        session = self.session(handler)
+        session.post(
+            "https://example.com/x",
+            data=b'{"a":1}',
+            headers={"Content-Type": "application/json"},
+        )
+        session.post("https://example.com/x", data={"a": "1", "b": "2"})
+        session.post("https://example.com/x", json={"a": 1})
+
+        assert seen[0] == ("application/json", b'{"a":1}')
+        assert seen[1] == ("application/x-www-form-urlencoded", b"a=1&b=2")
+        assert seen[2][0] == "application/json"
+
+    def test_errors_are_mapped(self):
+        """Test that httpx transport errors are raised as requests exceptions."""
+        for error, expected in (
+            (httpx.ReadTimeout("timed out"), requests.Timeout),
+            (httpx.ConnectError("refused"), requests.ConnectionError),
+        ):
+            with self.subTest(error=type(error).__name__):
+
+                def handler(request, error=error):
+                    raise error
+
+                with self.assertRaises(expected) as context:
+                    self.session(handler).get("https://example.com/x")
+
+                assert context.exception.__cause__ is error
+
+    def test_stream_errors_are_mapped(self):
+        """Test that transport errors raised mid-stream become requests exceptions."""
+
+        class BrokenStream(httpx.SyncByteStream):
+            def __iter__(self):
+                yield b"ab"
+                raise httpx.ReadError("connection reset")
+
+        def handler(request):
+            return httpx.Response(200, stream=BrokenStream())
+
+        response = self.session(handler).get("https://example.com/x", stream=True)
+
+        assert response.raw.read(2) == b"ab"
+        with self.assertRaises(requests.ConnectionError):
+            list(response.iter_content(2))
+
+    def test_default_client_follows_redirects(self):
+        """Test that the default client follows redirects like requests does."""
+        pytest.importorskip("h2")
+
+        session = HTTP2Session()
+        try:
+            assert session.client.follow_redirects is True
+        finally:
+            session.close()